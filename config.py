@@ -9,35 +9,42 @@ Search order (later entries override earlier):
 
 from __future__ import annotations
 
+import functools
+import os
+import pickle
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    try:
-        import tomli as tomllib  # type: ignore[no-redef]
-    except ImportError:
-        raise ImportError(
-            "tomli is required for Python < 3.11.  "
-            "Install it with: pip install tomli"
-        )
-
 # ---------------------------------------------------------------------------
 # Default configuration values
 # ---------------------------------------------------------------------------
 
 SYSTEM_CONF = Path("/etc/dadcam/dadcam.conf")
-USER_CONF = Path.home() / ".config" / "dadcam" / "dadcam.conf"
 
-DEFAULT_DESTINATION = str(Path.home() / "Pictures" / "dadcam_output")
-DEFAULT_LOG_FILE = str(
-    Path.home() / ".local" / "share" / "dadcam" / "logs" / "dadcam.log"
-)
-DEFAULT_MODEL_DIR = str(
-    Path.home() / ".local" / "share" / "dadcam" / "models"
-)
+# Home-relative defaults are computed lazily (and memoized) so importing this
+# module doesn't pay the Path.home() passwd lookup for subcommands that never
+# touch the config.
+
+
+@functools.cache
+def _user_conf() -> Path:
+    return Path.home() / ".config" / "dadcam" / "dadcam.conf"
+
+
+@functools.cache
+def _default_destination() -> str:
+    return str(Path.home() / "Pictures" / "dadcam_output")
+
+
+@functools.cache
+def _default_log_file() -> str:
+    return str(Path.home() / ".local" / "share" / "dadcam" / "logs" / "dadcam.log")
+
+
+@functools.cache
+def _default_model_dir() -> str:
+    return str(Path.home() / ".local" / "share" / "dadcam" / "models")
 
 CLASSES_OF_INTEREST: list[str] = [
     "person",
@@ -61,7 +68,7 @@ CLASSES_OF_INTEREST: list[str] = [
 
 @dataclass
 class PathsConfig:
-    destination: str = DEFAULT_DESTINATION
+    destination: str = field(default_factory=_default_destination)
     mount_point: str = "/mnt/dadcam_cf"
 
 
@@ -72,7 +79,8 @@ class DetectionConfig:
     classes_of_interest: list[str] = field(
         default_factory=lambda: list(CLASSES_OF_INTEREST)
     )
-    model_dir: str = DEFAULT_MODEL_DIR
+    model_dir: str = field(default_factory=_default_model_dir)
+    batch_size: int = 8             # video frames inferred per model call
 
 
 @dataclass
@@ -80,6 +88,15 @@ class VideoConfig:
     frame_sample_interval: int = 30  # process every N frames
 
 
+@dataclass
+class SorterConfig:
+    # Re-read and hash the destination after every copy.  The copy itself
+    # already hashes the source and the destination is fdatasync'd, so the
+    # re-read mostly verifies the page cache against itself; leave this off
+    # unless paranoid about the destination disk.
+    verify_hash_after_copy: bool = False
+
+
 @dataclass
 class ReportConfig:
     format: str = "markdown"
@@ -89,7 +106,7 @@ class ReportConfig:
 @dataclass
 class LoggingConfig:
     level: str = "INFO"
-    log_file: str = DEFAULT_LOG_FILE
+    log_file: str = field(default_factory=_default_log_file)
 
 
 @dataclass
@@ -97,6 +114,7 @@ class DadcamConfig:
     paths: PathsConfig = field(default_factory=PathsConfig)
     detection: DetectionConfig = field(default_factory=DetectionConfig)
     video: VideoConfig = field(default_factory=VideoConfig)
+    sorter: SorterConfig = field(default_factory=SorterConfig)
     report: ReportConfig = field(default_factory=ReportConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
 
@@ -107,17 +125,42 @@ class DadcamConfig:
 
 
 def _merge(base: dict, override: dict) -> dict:
-    """Recursively merge *override* into *base*, returning a new dict."""
-    result = dict(base)
+    """Recursively merge *override* into *base*.
+
+    Returns one of the inputs unchanged when the other is empty (the common
+    case: most config locations don't exist), so no copy is made then.
+    """
+    if not override:
+        return base
+    if not base:
+        return override
+    result = {**base}
     for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _merge(result[key], value)
+        existing = result.get(key)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            result[key] = _merge(existing, value)
         else:
             result[key] = value
     return result
 
 
+def _import_tomllib():
+    """Import the TOML parser lazily — only needed on a config cache miss."""
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        try:
+            import tomli as tomllib  # type: ignore[no-redef]
+        except ImportError:
+            raise ImportError(
+                "tomli is required for Python < 3.11.  "
+                "Install it with: pip install tomli"
+            )
+    return tomllib
+
+
 def _load_toml(path: Path) -> dict:
+    tomllib = _import_tomllib()
     try:
         with open(path, "rb") as fh:
             return tomllib.load(fh)
@@ -127,13 +170,71 @@ def _load_toml(path: Path) -> dict:
         raise ValueError(f"Failed to parse config file {path}: {exc}") from exc
 
 
+# ---------------------------------------------------------------------------
+# Parsed-config cache
+#
+# The merged raw dict is pickled to ~/.cache/dadcam/config.v1.pkl keyed by a
+# fingerprint (path, mtime_ns, size) of every existing source file.  On a hit
+# the TOML parser is never imported — config files change rarely, so every
+# systemd-triggered run takes the fast path.
+# ---------------------------------------------------------------------------
+
+
+def _config_cache_path() -> Path:
+    return Path.home() / ".cache" / "dadcam" / "config.v1.pkl"
+
+
+def _config_fingerprint(paths: list[Path]) -> list[tuple[str, int, int]]:
+    fp: list[tuple[str, int, int]] = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        fp.append((str(p), st.st_mtime_ns, st.st_size))
+    return fp
+
+
+def _load_cached_raw(fingerprint: list) -> dict | None:
+    try:
+        with open(_config_cache_path(), "rb") as fh:
+            cached = pickle.load(fh)
+        if cached.get("fingerprint") == fingerprint:
+            return cached["raw"]
+    except (OSError, EOFError, KeyError, ValueError, pickle.PickleError):
+        pass
+    return None
+
+
+def _store_cached_raw(fingerprint: list, raw: dict) -> None:
+    try:
+        path = _config_cache_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".pkl.tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump({"fingerprint": fingerprint, "raw": raw}, fh)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
 def load_config(extra_path: Path | None = None) -> DadcamConfig:
     """Load and merge config from all known locations."""
-    raw: dict = {}
-    for conf_path in [SYSTEM_CONF, USER_CONF]:
-        raw = _merge(raw, _load_toml(conf_path))
+    sources = [SYSTEM_CONF, _user_conf()]
     if extra_path:
-        raw = _merge(raw, _load_toml(extra_path))
+        sources.append(extra_path)
+
+    fingerprint = _config_fingerprint(sources)
+    cached = _load_cached_raw(fingerprint)
+    if cached is not None:
+        raw = cached
+    else:
+        raw = {}
+        # The fingerprint lists only the files that exist, so missing config
+        # locations don't pay an open() just to hit FileNotFoundError.
+        for conf_path, _mtime, _size in fingerprint:
+            raw = _merge(raw, _load_toml(Path(conf_path)))
+        _store_cached_raw(fingerprint, raw)
 
     cfg = DadcamConfig()
 
@@ -150,12 +251,20 @@ def load_config(extra_path: Path | None = None) -> DadcamConfig:
         "classes_of_interest", cfg.detection.classes_of_interest
     )
     cfg.detection.model_dir = d.get("model_dir", cfg.detection.model_dir)
+    cfg.detection.batch_size = int(
+        d.get("batch_size", cfg.detection.batch_size)
+    )
 
     v = raw.get("video", {})
     cfg.video.frame_sample_interval = int(
         v.get("frame_sample_interval", cfg.video.frame_sample_interval)
     )
 
+    s = raw.get("sorter", {})
+    cfg.sorter.verify_hash_after_copy = bool(
+        s.get("verify_hash_after_copy", cfg.sorter.verify_hash_after_copy)
+    )
+
     r = raw.get("report", {})
     cfg.report.format = r.get("format", cfg.report.format)
     cfg.report.keep_reports = int(
@@ -170,14 +279,25 @@ def load_config(extra_path: Path | None = None) -> DadcamConfig:
 
 
 def ensure_user_config_exists() -> None:
-    """Write a default config file to the user location if none exists."""
-    if USER_CONF.exists():
+    """Write a default config file to the user location if none exists.
+
+    A sentinel dotfile under ~/.cache/dadcam collapses the steady-state
+    check (exists + mkdir parents) to a single stat once the config has
+    been seen in place.
+    """
+    sentinel = Path.home() / ".cache" / "dadcam" / ".userconf-ok"
+    if sentinel.exists():
+        return
+
+    user_conf = _user_conf()
+    if user_conf.exists():
+        _touch_userconf_sentinel(sentinel)
         return
-    USER_CONF.parent.mkdir(parents=True, exist_ok=True)
-    USER_CONF.write_text(
+    user_conf.parent.mkdir(parents=True, exist_ok=True)
+    user_conf.write_text(
         f"""\
 [paths]
-destination = "{DEFAULT_DESTINATION}"
+destination = "{_default_destination()}"
 
 [detection]
 model = "yolov8n"
@@ -190,12 +310,24 @@ classes_of_interest = [
 [video]
 frame_sample_interval = 30
 
+[sorter]
+verify_hash_after_copy = false
+
 [report]
 keep_reports = 50
 
 [logging]
 level = "INFO"
-log_file = "{DEFAULT_LOG_FILE}"
+log_file = "{_default_log_file()}"
 """,
         encoding="utf-8",
     )
+    _touch_userconf_sentinel(sentinel)
+
+
+def _touch_userconf_sentinel(sentinel: Path) -> None:
+    try:
+        sentinel.parent.mkdir(parents=True, exist_ok=True)
+        sentinel.touch()
+    except OSError:
+        pass
@@ -37,25 +37,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from config import DadcamConfig, ensure_user_config_exists, load_config
-from detection import DetectionEngine
-from reporter import ReportWriter
-from scanner import MediaScanner
-from sorter import FileSorter, SortAction
 import whitelist as wl
 
-try:
-    from rich.console import Console
-    from rich.progress import (
-        BarColumn,
-        MofNCompleteColumn,
-        Progress,
-        SpinnerColumn,
-        TextColumn,
-        TimeElapsedColumn,
-    )
-    _RICH = True
-except ImportError:
-    _RICH = False
+# Heavy modules (detection pulls in torch/cv2/ultralytics, reporter/sorter
+# follow it) are imported lazily inside the process pipeline so that
+# --list-whitelist / --report / --setup start in ~100 ms instead of seconds.
 
 # ---------------------------------------------------------------------------
 # Logging setup
@@ -99,9 +85,105 @@ def _blkid_value(device: str, tag: str) -> str | None:
         return None
 
 
+def _devinfo_cache_path() -> Path:
+    return Path.home() / ".cache" / "dadcam" / "devinfo.json"
+
+
+def _load_devinfo_cache() -> dict:
+    try:
+        import json
+        with open(_devinfo_cache_path(), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_devinfo_cache(cache: dict) -> None:
+    try:
+        import json
+        path = _devinfo_cache_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(cache), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.debug("Could not write devinfo cache: %s", exc)
+
+
 def _get_device_info(device: str) -> tuple[str | None, str | None]:
-    """Return (uuid, serial) for the block device."""
-    uuid = _blkid_value(device, "UUID")
+    """Return (uuid, serial) for the block device.
+
+    Results are cached in ~/.cache/dadcam/devinfo.json keyed by the device's
+    major:minor number, so re-inserting the same card skips the blkid
+    subprocess and the pyudev import.  The device node's mtime (set on each
+    hot-plug event) invalidates stale entries.
+    """
+    try:
+        st = os.stat(device)
+        cache_key = f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+        mtime_ns = st.st_mtime_ns
+    except OSError:
+        cache_key = None
+        mtime_ns = None
+
+    cache = _load_devinfo_cache() if cache_key else {}
+    entry = cache.get(cache_key) if cache_key else None
+    if entry and entry.get("mtime_ns") == mtime_ns:
+        return entry.get("uuid"), entry.get("serial")
+
+    uuid, serial = _query_device_info(device)
+
+    if cache_key:
+        cache[cache_key] = {"uuid": uuid, "serial": serial, "mtime_ns": mtime_ns}
+        _save_devinfo_cache(cache)
+    return uuid, serial
+
+
+def _dev_link_match(link_dir: str, device: str) -> str | None:
+    """Return the /dev/disk/<link_dir> entry name whose target is *device*,
+    matched by st_rdev.  No fork, no output parsing."""
+    try:
+        target = os.stat(device).st_rdev
+        with os.scandir(link_dir) as it:
+            for entry in it:
+                try:
+                    if os.stat(entry.path).st_rdev == target:
+                        return entry.name
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return None
+
+
+def _uuid_from_by_uuid(device: str) -> str | None:
+    """Filesystem UUID straight from the /dev/disk/by-uuid symlinks."""
+    return _dev_link_match("/dev/disk/by-uuid", device)
+
+
+def _serial_from_by_id(device: str) -> str | None:
+    """Best-effort serial from the /dev/disk/by-id symlink name.
+
+    Entries look like ``usb-LEXAR_CF_12345-0:0-part1``; strip the bus
+    prefix and any ``-partN`` suffix.  Only used when pyudev is missing,
+    so setup and processing derive the serial the same way.
+    """
+    name = _dev_link_match("/dev/disk/by-id", device)
+    if not name:
+        return None
+    serial = name.partition("-")[2] or name
+    serial = serial.split("-part")[0]
+    return serial or None
+
+
+def _query_device_info(device: str) -> tuple[str | None, str | None]:
+    """Uncached (uuid, serial) lookup.
+
+    The UUID is read from /dev/disk/by-uuid, avoiding the blkid fork on
+    the common path; blkid remains the fallback for filesystems udev
+    didn't symlink.
+    """
+    uuid = _uuid_from_by_uuid(device) or _blkid_value(device, "UUID")
 
     # Try pyudev for serial
     serial: str | None = None
@@ -117,11 +199,60 @@ def _get_device_info(device: str) -> tuple[str | None, str | None]:
     except Exception:
         pass
 
+    if serial is None:
+        serial = _serial_from_by_id(device)
+
     return uuid, serial
 
 
+def _udisks_filesystem(device: str):
+    """Resolve *device* to its UDisks2 Filesystem DBus proxy, or None."""
+    import pydbus  # type: ignore[import-untyped]
+    from gi.repository import GLib  # type: ignore[import-untyped]
+
+    bus = pydbus.SystemBus()
+    manager = bus.get(".UDisks2", "/org/freedesktop/UDisks2/Manager")
+    objects = manager.ResolveDevice({"path": GLib.Variant("s", device)}, {})
+    if not objects:
+        return None
+    return bus.get(".UDisks2", objects[0])
+
+
+def _mount_device_dbus(device: str) -> str | None:
+    """Mount via the UDisks2 DBus API — typed return value, no fork or
+    stdout parsing.  Returns None so the caller falls back to udisksctl."""
+    try:
+        fs = _udisks_filesystem(device)
+        if fs is None:
+            return None
+        points = getattr(fs, "MountPoints", None)
+        if points:
+            # Already mounted — MountPoints entries are NUL-terminated bytes.
+            return bytes(points[0]).rstrip(b"\x00").decode()
+        return fs.Mount({})
+    except Exception as exc:
+        logger.debug("UDisks2 DBus mount unavailable (%s) — using udisksctl", exc)
+        return None
+
+
+def _unmount_device_dbus(device: str) -> bool:
+    try:
+        fs = _udisks_filesystem(device)
+        if fs is None:
+            return False
+        fs.Unmount({})
+        return True
+    except Exception as exc:
+        logger.debug("UDisks2 DBus unmount unavailable (%s) — using udisksctl", exc)
+        return False
+
+
 def _mount_device(device: str) -> str | None:
-    """Mount device using udisksctl. Returns the mount path or None on failure."""
+    """Mount device via UDisks2 DBus, falling back to udisksctl.
+    Returns the mount path or None on failure."""
+    mount_path = _mount_device_dbus(device)
+    if mount_path:
+        return mount_path
     try:
         result = subprocess.run(
             ["udisksctl", "mount", "-b", device, "--no-user-interaction"],
@@ -142,7 +273,30 @@ def _mount_device(device: str) -> str | None:
     return None
 
 
+_CAMERA_DIRS = {"DCIM", "MISC", "PRIVATE"}
+
+
+def _has_camera_layout(mount_path: Path) -> bool:
+    """Cheap top-level sniff for a camera card (DCIM & friends).
+
+    Uses os.scandir so directory types come from d_type without a stat per
+    entry.  Keeps a whitelisted-but-random drive from being deep-scanned.
+    """
+    try:
+        with os.scandir(mount_path) as it:
+            return any(
+                entry.is_dir(follow_symlinks=False)
+                and entry.name.upper() in _CAMERA_DIRS
+                for entry in it
+            )
+    except OSError:
+        return False
+
+
 def _unmount_device(device: str) -> None:
+    if _unmount_device_dbus(device):
+        logger.info("Unmounted %s", device)
+        return
     try:
         subprocess.run(
             ["udisksctl", "unmount", "-b", device, "--no-user-interaction"],
@@ -154,6 +308,41 @@ def _unmount_device(device: str) -> None:
         pass
 
 
+# ---------------------------------------------------------------------------
+# Parallel detection workers
+#
+# Each worker process loads its own DetectionEngine once (via the pool
+# initializer) and then handles files one at a time.  Sorting stays on the
+# main process so there is a single writer for the destination tree.
+# ---------------------------------------------------------------------------
+
+# Minimum number of media files before spinning up worker processes — model
+# load per worker isn't worth it for a handful of files.
+_PARALLEL_MIN_FILES = 8
+_MAX_DETECT_WORKERS = 4
+
+_worker_engine = None
+
+
+def _detect_worker_init(det_cfg, worker_threads: int) -> None:
+    global _worker_engine
+    worker_threads = max(1, worker_threads)
+    try:
+        import torch  # type: ignore[import-untyped]
+        # Split the cores between workers so torch doesn't oversubscribe.
+        torch.set_num_threads(worker_threads)
+    except ImportError:
+        pass
+    from detection import DetectionEngine
+    # Same budget for the onnxruntime intra-op pool on the fast path.
+    _worker_engine = DetectionEngine(det_cfg, num_threads=worker_threads)
+
+
+def _detect_worker(job):
+    index, media_file = job
+    return index, _worker_engine.process(media_file)
+
+
 # ---------------------------------------------------------------------------
 # Process pipeline
 # ---------------------------------------------------------------------------
@@ -186,6 +375,13 @@ def run_process(device: str, cfg: DadcamConfig, dry_run: bool = False) -> int:
     logger.info("Mounted at: %s", mount_path)
 
     try:
+        # Only applies to device mounts — --source directories are scanned
+        # as-is since users point those at arbitrary photo folders.
+        if not _has_camera_layout(mount_path):
+            logger.info(
+                "No DCIM-like layout found on %s — nothing to process", mount_path
+            )
+            return 0
         return _process_mounted(device, mount_path, cfg, run_start, dry_run=dry_run)
     finally:
         _unmount_device(device)
@@ -198,6 +394,25 @@ def _process_mounted(
     run_start: datetime,
     dry_run: bool = False,
 ) -> int:
+    from detection import DetectionEngine
+    from reporter import ReportWriter
+    from scanner import MediaScanner
+    from sorter import FileSorter, SortAction
+
+    try:
+        from rich.console import Console
+        from rich.progress import (
+            BarColumn,
+            MofNCompleteColumn,
+            Progress,
+            SpinnerColumn,
+            TextColumn,
+            TimeElapsedColumn,
+        )
+        use_rich = True
+    except ImportError:
+        use_rich = False
+
     dest_path = Path(cfg.paths.destination)
 
     # ── 3. Scan ───────────────────────────────────────────────────────────
@@ -215,12 +430,40 @@ def _process_mounted(
 
     logger.info("Found %d media files", len(media_files))
 
-    # ── 4 + 5. Detect + Sort ──────────────────────────────────────────────
-    engine = DetectionEngine(cfg.detection)
-    sorter = FileSorter(cfg.paths, dry_run=dry_run)
-    sort_results = []
+    # ── 4. Detect ─────────────────────────────────────────────────────────
+    n_workers = min(_MAX_DETECT_WORKERS, os.cpu_count() or 1, len(media_files))
+    parallel = len(media_files) >= _PARALLEL_MIN_FILES and n_workers > 1
+
+    detections: list = [None] * len(media_files)
+
+    def run_detection(advance) -> None:
+        if parallel:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            worker_threads = max(1, (os.cpu_count() or 1) // n_workers)
+            logger.info("Running detection in %d worker processes", n_workers)
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_detect_worker_init,
+                initargs=(cfg.detection, worker_threads),
+            ) as pool:
+                futures = [
+                    pool.submit(_detect_worker, (i, mf))
+                    for i, mf in enumerate(media_files)
+                ]
+                for fut in as_completed(futures):
+                    i, det = fut.result()
+                    detections[i] = det
+                    advance(media_files[i])
+        else:
+            engine = DetectionEngine(cfg.detection)
+            for i, mf in enumerate(media_files):
+                detections[i] = engine.process(mf)
+                advance(mf)
+
+    # ── 5. Sort (threaded on the main process) ────────────────────────────
+    sorter = FileSorter(cfg.paths, dry_run=dry_run, sorter_config=cfg.sorter)
 
-    if _RICH:
+    if use_rich:
         console = Console()
         progress = Progress(
             SpinnerColumn(),
@@ -230,21 +473,34 @@ def _process_mounted(
             TimeElapsedColumn(),
             console=console,
         )
-        task = progress.add_task("Processing", total=len(media_files))
 
         with progress:
-            for mf in media_files:
+            task = progress.add_task("Detecting", total=len(media_files))
+
+            def advance(mf) -> None:
                 progress.update(task, description=f"[cyan]{mf.path.name[:40]}[/cyan]")
-                det = engine.process(mf)
-                result = sorter.sort(mf, det)
-                sort_results.append(result)
                 progress.advance(task)
+
+            run_detection(advance)
+
+            sort_task = progress.add_task("Sorting", total=len(media_files))
+            sort_results = sorter.sort_many(
+                list(zip(media_files, detections)),
+                progress_cb=lambda _res: progress.advance(sort_task),
+            )
     else:
-        for i, mf in enumerate(media_files, 1):
-            print(f"[{i}/{len(media_files)}] {mf.path.name}", file=sys.stderr)
-            det = engine.process(mf)
-            result = sorter.sort(mf, det)
-            sort_results.append(result)
+        done = 0
+
+        def advance(mf) -> None:
+            nonlocal done
+            done += 1
+            print(f"[{done}/{len(media_files)}] {mf.path.name}", file=sys.stderr)
+
+        run_detection(advance)
+        sort_results = sorter.sort_many(list(zip(media_files, detections)))
+
+    # Deferred source removals (io_uring batching) happen here, in one go.
+    sorter.flush_unlinks()
 
     # ── 6. Report ─────────────────────────────────────────────────────────
     run_end = datetime.now()
@@ -275,7 +531,7 @@ def _process_mounted(
         )
     logger.info("Report: %s", report_path)
 
-    if _RICH:
+    if use_rich:
         if dry_run:
             Console().print(
                 f"\n[bold yellow]Dry run complete.[/bold yellow] "
@@ -2,22 +2,30 @@
 detection.py — DetectionEngine: run animal/person detection on images and video.
 
 Model priority:
-  1. YOLOv8n via ultralytics  (default)
-  2. YOLOv5s via ultralytics  (fallback if yolov8n unavailable)
+  1. YOLOv8n exported to ONNX + dynamic int8, via onnxruntime (if installed)
+  2. YOLOv8n via ultralytics/PyTorch  (default fallback)
+  3. YOLOv5s via ultralytics  (fallback if yolov8n unavailable)
 
 Model weights are cached in ~/.local/share/dadcam/models/.
 """
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
+import queue
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 
 import cv2
 import numpy as np
-from PIL import Image
+
+try:
+    import pyvips  # type: ignore[import-untyped]
+except ImportError:
+    pyvips = None
 
 from config import DetectionConfig
 from scanner import MediaFile, MediaType
@@ -53,6 +61,24 @@ class DetectionResult:
 DETECTION_ERROR = DetectionResult(detected=False, error="detection_error")
 
 
+@contextlib.contextmanager
+def _export_lock(lock_path: Path):
+    """Serialize one-time model exports across processes.
+
+    The parallel-detection workers all construct an engine at startup; an
+    flock around the export keeps them from racing the first-run
+    conversion (and from loading several full torch models at once just
+    to export the same artifact).  Holders should re-check whether the
+    artifact appeared while they waited.
+    """
+    import fcntl
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        yield
+
+
 # ---------------------------------------------------------------------------
 # DetectionEngine
 # ---------------------------------------------------------------------------
@@ -64,19 +90,48 @@ class DetectionEngine:
     CPU-only; no GPU required.
     """
 
-    def __init__(self, config: DetectionConfig) -> None:
+    # Static input resolution for the exported ONNX graph.
+    _INPUT_SIZE = 640
+    _NMS_IOU_THRESHOLD = 0.45
+
+    def __init__(
+        self, config: DetectionConfig, num_threads: int | None = None
+    ) -> None:
         self.config = config
-        self.model = self._load_model()
-        # Map model class names to lowercased strings once
-        self._class_names: list[str] = [
-            n.lower() for n in self.model.names.values()
-        ]
+        self.model = None
+        # Per-engine CPU budget; None means "all cores".  The parallel
+        # workers pass their share so four engines don't each spin up an
+        # all-core onnxruntime pool.
+        self._num_threads = num_threads
+        # Reused preprocessing buffers for the ONNX path (lazy-allocated).
+        self._input_buf: np.ndarray | None = None
+        self._letterbox_canvas: np.ndarray | None = None
+        self._session = self._load_onnx_session()
+        if self._session is None:
+            self.model = self._load_model()
+            # Map model class names to lowercased strings once
+            self._class_names: list[str] = [
+                n.lower() for n in self.model.names.values()
+            ]
         self._interest_set: set[str] = set(
             c.lower() for c in config.classes_of_interest
         )
+        # Class-id indexed lookups: a boolean whitelist mask and the label
+        # strings as a numpy array, so per-box filtering never builds a
+        # Python string for uninteresting classes.
+        self._label_array = np.array(self._class_names)
+        self._interest_mask = np.array(
+            [n in self._interest_set for n in self._class_names], dtype=bool
+        )
+        # Integer class ids for scalar filtering — int hashing beats string
+        # hashing and skips the label lookup for discarded boxes.
+        self._interest_ids: frozenset[int] = frozenset(
+            i for i, n in enumerate(self._class_names) if n in self._interest_set
+        )
         logger.info(
-            "DetectionEngine ready — model: %s, classes: %s",
+            "DetectionEngine ready — model: %s (%s), classes: %s",
             config.model,
+            "onnxruntime int8" if self._session is not None else "pytorch",
             sorted(self._interest_set),
         )
 
@@ -103,6 +158,30 @@ class DetectionEngine:
             else f"{self.config.model}.pt"
 
         local_path = model_dir / model_name
+
+        # Prefer a cached TorchScript trace — it loads without re-parsing the
+        # checkpoint or rebuilding the nn.Module graph, and runs with fused
+        # CPU kernels.  Skipped if the trace lost its class-name metadata.
+        ts_path = local_path.with_suffix(".torchscript")
+        if ts_path.exists():
+            try:
+                model = YOLO(str(ts_path))
+                names = getattr(model, "names", None) or {}
+                if "person" in {str(n).lower() for n in names.values()}:
+                    logger.info("Loading TorchScript model from cache: %s", ts_path)
+                    return model
+                logger.debug(
+                    "TorchScript cache lacks class names — loading .pt instead"
+                )
+            except Exception as exc:
+                logger.debug("Could not load TorchScript cache: %s", exc)
+                # A trace that fails to load is never going to get better;
+                # drop it so the export below can repair the cache.
+                try:
+                    ts_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
         if local_path.exists():
             logger.info("Loading model from cache: %s", local_path)
             model = YOLO(str(local_path))
@@ -124,8 +203,232 @@ class DetectionEngine:
 
         # Force CPU
         model.to("cpu")
+
+        # One-time TorchScript export so future runs take the fast path
+        # above.  Same single-flight treatment as the ONNX export: the
+        # flock keeps parallel workers from tracing the model 4x over,
+        # and the temp + os.replace keeps a half-written trace from ever
+        # appearing at ts_path.
+        if not ts_path.exists():
+            try:
+                import shutil
+                with _export_lock(model_dir / f".{local_path.stem}.ts.lock"):
+                    if not ts_path.exists():
+                        exported = Path(
+                            model.export(
+                                format="torchscript",
+                                imgsz=self._INPUT_SIZE,
+                                optimize=True,
+                            )
+                        )
+                        if exported.resolve() != ts_path.resolve():
+                            tmp = ts_path.with_suffix(".torchscript.tmp")
+                            shutil.move(str(exported), str(tmp))
+                            os.replace(tmp, ts_path)
+                        logger.info("Cached TorchScript model: %s", ts_path)
+            except Exception as exc:
+                logger.debug("TorchScript export failed (non-fatal): %s", exc)
+
         return model
 
+    # ------------------------------------------------------------------
+    # ONNX Runtime fast path
+    # ------------------------------------------------------------------
+
+    def _load_onnx_session(self):
+        """
+        Build an onnxruntime session for the configured model, exporting
+        (and dynamically int8-quantizing) the .pt checkpoint on first use.
+
+        Returns None whenever onnxruntime is unavailable, the model is not
+        a yolov8 variant, or export fails — the caller then falls back to
+        the ultralytics/PyTorch path.
+        """
+        try:
+            import onnxruntime as ort  # type: ignore[import-untyped]
+        except ImportError:
+            logger.debug("onnxruntime not installed — using PyTorch inference")
+            return None
+
+        # The numpy post-processor below assumes the yolov8 output head.
+        if not self.config.model.startswith("yolov8"):
+            logger.debug(
+                "ONNX fast path only supports yolov8 models, got %s",
+                self.config.model,
+            )
+            return None
+
+        model_dir = Path(self.config.model_dir)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.config.model.removesuffix(".pt")
+
+        fp32_path = model_dir / f"{stem}.onnx"
+        int8_path = model_dir / f"{stem}.int8.onnx"
+        names_path = model_dir / f"{stem}_classes.json"
+
+        if not int8_path.exists() and not fp32_path.exists():
+            try:
+                with _export_lock(model_dir / f".{stem}.onnx.lock"):
+                    # Another worker may have finished while we waited.
+                    if not int8_path.exists() and not fp32_path.exists():
+                        self._export_onnx(fp32_path, int8_path, names_path)
+            except Exception as exc:
+                logger.warning(
+                    "ONNX export failed (%s) — using PyTorch inference", exc
+                )
+                return None
+
+        onnx_path = int8_path if int8_path.exists() else fp32_path
+        try:
+            import json
+            names = json.loads(names_path.read_text(encoding="utf-8"))
+            opts = ort.SessionOptions()
+            opts.intra_op_num_threads = self._num_threads or (os.cpu_count() or 1)
+            session = ort.InferenceSession(
+                str(onnx_path),
+                sess_options=opts,
+                providers=["CPUExecutionProvider"],
+            )
+        except Exception as exc:
+            logger.warning(
+                "Could not load ONNX model %s (%s) — using PyTorch inference",
+                onnx_path,
+                exc,
+            )
+            return None
+
+        self._class_names = [n.lower() for n in names]
+        self._input_name = session.get_inputs()[0].name
+        logger.info("Loading ONNX model: %s", onnx_path)
+        return session
+
+    def _export_onnx(
+        self, fp32_path: Path, int8_path: Path, names_path: Path
+    ) -> None:
+        """One-time export of the .pt checkpoint to a static 640×640 ONNX
+        graph, plus dynamic int8 weight quantization when available.
+
+        Every artifact lands at its final path via os.replace, so a crash
+        (or a concurrent reader) can never observe a partially written
+        model — existence of a file always means it is complete.
+        """
+        import json
+        import shutil
+
+        yolo = self._load_model()
+        logger.info("Exporting %s to ONNX (one-time)", self.config.model)
+        exported = yolo.export(
+            format="onnx",
+            imgsz=self._INPUT_SIZE,
+            simplify=True,
+            dynamic=False,
+        )
+        exported_path = Path(exported)
+        if exported_path.resolve() != fp32_path.resolve():
+            tmp = fp32_path.with_suffix(".onnx.tmp")
+            shutil.move(str(exported_path), str(tmp))
+            os.replace(tmp, fp32_path)
+
+        names = [yolo.names[i] for i in sorted(yolo.names)]
+        names_tmp = names_path.with_suffix(".json.tmp")
+        names_tmp.write_text(json.dumps(names), encoding="utf-8")
+        os.replace(names_tmp, names_path)
+
+        try:
+            from onnxruntime.quantization import (  # type: ignore[import-untyped]
+                QuantType,
+                quantize_dynamic,
+            )
+            int8_tmp = int8_path.with_suffix(".onnx.tmp")
+            quantize_dynamic(
+                str(fp32_path), str(int8_tmp), weight_type=QuantType.QUInt8
+            )
+            os.replace(int8_tmp, int8_path)
+            logger.info("Quantized ONNX model written: %s", int8_path)
+        except Exception as exc:
+            logger.warning(
+                "int8 quantization failed (%s) — keeping FP32 ONNX", exc
+            )
+
+    def _letterbox(self, frame_bgr: np.ndarray) -> np.ndarray:
+        """Resize + pad a BGR frame into the reused static input tensor.
+
+        The uint8 canvas and the float32 (1, 3, 640, 640) input buffer are
+        allocated once and rewritten per frame, so preprocessing does no
+        per-call allocation.  Not thread-safe; each engine instance runs
+        inference from a single thread.
+        """
+        size = self._INPUT_SIZE
+        if self._input_buf is None:
+            self._letterbox_canvas = np.empty((size, size, 3), dtype=np.uint8)
+            self._input_buf = np.empty((1, 3, size, size), dtype=np.float32)
+
+        h, w = frame_bgr.shape[:2]
+        scale = min(size / h, size / w)
+        nh, nw = round(h * scale), round(w * scale)
+        resized = cv2.resize(frame_bgr, (nw, nh), interpolation=cv2.INTER_LINEAR)
+
+        canvas = self._letterbox_canvas
+        canvas[:] = 114
+        top = (size - nh) // 2
+        left = (size - nw) // 2
+        canvas[top:top + nh, left:left + nw] = resized
+
+        # HWC BGR uint8 → CHW RGB float32/255, written straight into the
+        # reused input buffer (the reversed channel slice handles BGR→RGB).
+        np.divide(
+            canvas[:, :, ::-1].transpose(2, 0, 1),
+            255.0,
+            out=self._input_buf[0],
+            casting="unsafe",
+        )
+        return self._input_buf
+
+    def _onnx_infer(self, frame_bgr: np.ndarray) -> DetectionResult:
+        x = self._letterbox(frame_bgr)
+        outputs = self._session.run(None, {self._input_name: x})
+        return self._parse_onnx_output(outputs[0])
+
+    def _parse_onnx_output(self, out: np.ndarray) -> DetectionResult:
+        """Confidence filter + NMS over the raw yolov8 (1, 84, 8400) head."""
+        pred = out[0]                 # (4 + num_classes, num_anchors)
+        class_scores = pred[4:]       # (num_classes, num_anchors)
+        cls = class_scores.argmax(axis=0)
+        conf = class_scores.max(axis=0)
+
+        keep = conf >= self.config.confidence_threshold
+        if not keep.any():
+            return DetectionResult(detected=False)
+
+        boxes_cxcywh = pred[:4, keep].T
+        cls = cls[keep]
+        conf = conf[keep]
+
+        # cx,cy,w,h → x,y,w,h for cv2's NMS
+        boxes_xywh = boxes_cxcywh.copy()
+        boxes_xywh[:, 0] -= boxes_xywh[:, 2] / 2
+        boxes_xywh[:, 1] -= boxes_xywh[:, 3] / 2
+        picked = cv2.dnn.NMSBoxes(
+            boxes_xywh.tolist(),
+            conf.tolist(),
+            self.config.confidence_threshold,
+            self._NMS_IOU_THRESHOLD,
+        )
+
+        labels: list[str] = []
+        confidences: list[float] = []
+        for i in np.asarray(picked).flatten():
+            cls_idx = int(cls[i])
+            if cls_idx not in self._interest_ids:
+                continue
+            labels.append(self._class_names[cls_idx])
+            confidences.append(round(float(conf[i]), 4))
+
+        detected = len(labels) > 0
+        return DetectionResult(
+            detected=detected, labels=labels, confidences=confidences
+        )
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -146,49 +449,114 @@ class DetectionEngine:
     # ------------------------------------------------------------------
 
     def _process_image(self, path: Path) -> DetectionResult:
-        try:
-            img = Image.open(path).convert("RGB")
-        except Exception as exc:
-            logger.warning("Cannot open image %s: %s", path, exc)
-            return DetectionResult(detected=False, error=f"open_error: {exc}")
-
-        return self._run_inference_pil(img)
-
-    def _run_inference_pil(self, img: Image.Image) -> DetectionResult:
+        img = self._decode_image(path)
+        if img is None:
+            logger.warning("Cannot open image %s", path)
+            return DetectionResult(detected=False, error="open_error")
+
+        return self._run_inference_bgr(img)
+
+    def _decode_image(self, path: Path) -> np.ndarray | None:
+        """Decode an image to a BGR ndarray.
+
+        When pyvips is installed, decode through Image.thumbnail, which uses
+        libjpeg's DCT-scale shrink-on-load — only the needed coefficients are
+        decoded, typically several times faster than a full-resolution read
+        when the inference input is 640 px.  Aspect ratio is preserved (no
+        crop) so letterboxing downstream behaves as with a full decode.
+        Falls back to cv2.imread otherwise.
+        """
+        if pyvips is not None:
+            try:
+                thumb = pyvips.Image.thumbnail(
+                    str(path),
+                    self._INPUT_SIZE,
+                    height=self._INPUT_SIZE,
+                    size=pyvips.enums.Size.DOWN,
+                )
+                if thumb.bands == 4:
+                    thumb = thumb.flatten()
+                if thumb.bands == 3:
+                    arr = np.ndarray(
+                        buffer=thumb.write_to_memory(),
+                        dtype=np.uint8,
+                        shape=[thumb.height, thumb.width, thumb.bands],
+                    )
+                    # vips delivers RGB; the inference helpers expect BGR.
+                    return np.ascontiguousarray(arr[:, :, ::-1])
+                logger.debug(
+                    "pyvips produced %d bands for %s — falling back to cv2",
+                    thumb.bands,
+                    path.name,
+                )
+            except Exception as exc:
+                logger.debug(
+                    "pyvips decode failed for %s (%s) — falling back to cv2",
+                    path.name,
+                    exc,
+                )
+
+        # cv2.imread yields a BGR ndarray that ultralytics consumes directly.
+        return cv2.imread(str(path), cv2.IMREAD_COLOR)
+
+    def _run_inference_bgr(self, frame: np.ndarray) -> DetectionResult:
+        """Run inference on a BGR ndarray without any colour conversion."""
+        if self._session is not None:
+            return self._onnx_infer(frame)
+        # No device kwarg: the model was moved to CPU at load time, and
+        # repeating it makes the predictor re-check its setup every call.
         results = self.model(
-            img,
+            frame,
             verbose=False,
             conf=self.config.confidence_threshold,
-            device="cpu",
+            imgsz=self._INPUT_SIZE,
+            stream=False,
         )
         return self._parse_results(results)
 
-    def _run_inference_array(self, frame: np.ndarray) -> DetectionResult:
-        # Convert BGR (OpenCV) → RGB
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def _run_inference_batch(
+        self, frames: list[np.ndarray], frame_indices: list[int]
+    ) -> list[tuple[int, DetectionResult]]:
+        """Run inference on a batch of BGR frames in one model call.
+
+        Batching amortizes ultralytics preprocessing and lets the threaded
+        CPU backend work on several frames at once.  Returns
+        (frame_idx, result) pairs in input order.
+        """
+        if self._session is not None:
+            # The exported ONNX graph has a static batch dimension of 1.
+            return [
+                (idx, self._onnx_infer(frame))
+                for idx, frame in zip(frame_indices, frames)
+            ]
+        # ultralytics consumes BGR ndarrays natively — no cvtColor copy.
         results = self.model(
-            rgb,
+            frames,
             verbose=False,
             conf=self.config.confidence_threshold,
-            device="cpu",
+            imgsz=self._INPUT_SIZE,
+            stream=False,
         )
-        return self._parse_results(results)
+        return [
+            (idx, self._parse_results([res]))
+            for idx, res in zip(frame_indices, results)
+        ]
 
     def _parse_results(self, results) -> DetectionResult:
         labels: list[str] = []
         confidences: list[float] = []
 
         for result in results:
-            if result.boxes is None:
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
                 continue
-            for box in result.boxes:
-                cls_idx = int(box.cls[0].item())
-                conf = float(box.conf[0].item())
-                label = self._class_names[cls_idx] if cls_idx < len(self._class_names) else str(cls_idx)
-                if label not in self._interest_set:
-                    continue
-                labels.append(label)
-                confidences.append(round(conf, 4))
+            # Pull the whole cls/conf tensors to numpy once instead of a
+            # tensor→scalar round-trip per box.
+            cls = boxes.cls.cpu().numpy().astype(np.int32)
+            conf = boxes.conf.cpu().numpy()
+            keep = self._interest_mask[cls]
+            labels.extend(self._label_array[cls[keep]].tolist())
+            confidences.extend(np.round(conf[keep], 4).tolist())
 
         detected = len(labels) > 0
         return DetectionResult(detected=detected, labels=labels, confidences=confidences)
@@ -197,6 +565,39 @@ class DetectionEngine:
     # Video
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _decode_worker(
+        cap,
+        interval: int,
+        frame_queue: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        """Producer: grab every frame, decode only the sampled ones, and
+        push (frame_idx, frame) tuples.  A trailing None marks EOF."""
+        frame_idx = 0
+        try:
+            while not stop.is_set():
+                if not cap.grab():
+                    break
+                if frame_idx % interval == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        while not stop.is_set():
+                            try:
+                                frame_queue.put((frame_idx, frame), timeout=0.5)
+                                break
+                            except queue.Full:
+                                continue
+                frame_idx += 1
+        finally:
+            # Deliver the EOF marker unless the consumer already gave up.
+            while not stop.is_set():
+                try:
+                    frame_queue.put(None, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
     def _process_video(self, path: Path) -> DetectionResult:
         cap = cv2.VideoCapture(str(path))
         if not cap.isOpened():
@@ -204,32 +605,58 @@ class DetectionEngine:
             return DetectionResult(detected=False, error="video_open_error")
 
         interval = self.config.frame_sample_interval
+        batch_size = max(1, self.config.batch_size)
         all_labels: list[str] = []
         all_confidences: list[float] = []
         detection_frames: list[int] = []
-        frame_idx = 0
+        pending_frames: list[np.ndarray] = []
+        pending_indices: list[int] = []
+
+        def flush_batch() -> None:
+            if not pending_frames:
+                return
+            for idx, frame_result in self._run_inference_batch(
+                pending_frames, pending_indices
+            ):
+                if frame_result.detected:
+                    detection_frames.append(idx)
+                    all_labels.extend(frame_result.labels)
+                    all_confidences.extend(frame_result.confidences)
+                    logger.debug(
+                        "Video %s frame %d: %s",
+                        path.name,
+                        idx,
+                        frame_result.summary(),
+                    )
+            pending_frames.clear()
+            pending_indices.clear()
+
+        # Decode in a producer thread so libavcodec (which releases the GIL)
+        # overlaps with inference on the main thread.  The bounded queue
+        # keeps at most ~2 batches of frames in memory.
+        frame_queue: queue.Queue = queue.Queue(maxsize=batch_size * 2)
+        stop = threading.Event()
+        decoder = threading.Thread(
+            target=self._decode_worker,
+            args=(cap, interval, frame_queue, stop),
+            daemon=True,
+        )
+        decoder.start()
 
         try:
             while True:
-                ret, frame = cap.read()
-                if not ret:
+                item = frame_queue.get()
+                if item is None:
                     break
-
-                if frame_idx % interval == 0:
-                    frame_result = self._run_inference_array(frame)
-                    if frame_result.detected:
-                        detection_frames.append(frame_idx)
-                        all_labels.extend(frame_result.labels)
-                        all_confidences.extend(frame_result.confidences)
-                        logger.debug(
-                            "Video %s frame %d: %s",
-                            path.name,
-                            frame_idx,
-                            frame_result.summary(),
-                        )
-
-                frame_idx += 1
+                idx, frame = item
+                pending_frames.append(frame)
+                pending_indices.append(idx)
+                if len(pending_frames) >= batch_size:
+                    flush_batch()
+            flush_batch()
         finally:
+            stop.set()
+            decoder.join()
             cap.release()
 
         # Deduplicate labels (keep highest confidence per class)
@@ -19,6 +19,41 @@ from sorter import SortAction, SortResult
 
 logger = logging.getLogger(__name__)
 
+# Actions whose files actually reached (or would reach) the destination —
+# only these count toward the "files with detections" metric.
+_DETECTED_ACTIONS: frozenset[SortAction] = frozenset(
+    {SortAction.MOVED, SortAction.SKIP_DUPLICATE, SortAction.DRY_RUN}
+)
+
+# Enum .name is a descriptor lookup per access; a plain dict keeps the
+# per-row formatter to one hash lookup.
+_ACTION_NAMES: dict[SortAction, str] = {a: a.name for a in SortAction}
+
+
+def _row(r: SortResult) -> str:
+    """Format one per-file result as a Markdown table row."""
+    fname = r.media_file.path.name
+    ftype = r.media_file.media_type.name.lower()
+    det_icon = "✓" if r.detection.detected else "✗"
+    if r.detection.error:
+        det_icon = "⚠"
+    labels_str = ", ".join(r.detection.labels) if r.detection.labels else "—"
+    conf_str = (
+        ", ".join(f"{c:.2f}" for c in r.detection.confidences)
+        if r.detection.confidences
+        else "—"
+    )
+    action_str = _ACTION_NAMES[r.action]
+    if r.detection.error and r.action in (
+        SortAction.DETECTION_ERROR, SortAction.COPY_ERROR
+    ):
+        action_str = f"{action_str} ({r.detection.error})"
+
+    return (
+        f"| {fname} | {ftype} | {det_icon} | "
+        f"{labels_str} | {conf_str} | {action_str} |\n"
+    )
+
 
 # ---------------------------------------------------------------------------
 # ReportWriter
@@ -43,8 +78,10 @@ class ReportWriter:
         ts = now.strftime("%Y-%m-%d_%H-%M-%S")
         report_path = self.reports_dir / f"{ts}.md"
 
-        content = self._render(results, device, run_start, run_end)
-        report_path.write_text(content, encoding="utf-8")
+        # Stream the report straight to disk — no full-document string is
+        # ever built, so memory stays flat regardless of run size.
+        with report_path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+            self._write(fh, results, device, run_start, run_end)
         logger.info("Report written: %s", report_path)
 
         self._prune(self.config.keep_reports)
@@ -54,13 +91,14 @@ class ReportWriter:
     # Rendering
     # ------------------------------------------------------------------
 
-    def _render(
+    def _write(
         self,
+        fh,
         results: list[SortResult],
         device: str,
         run_start: datetime | None,
         run_end: datetime | None,
-    ) -> str:
+    ) -> None:
         now = run_end or datetime.now()
         start_str = run_start.strftime("%Y-%m-%d %H:%M:%S") if run_start else "—"
         end_str = now.strftime("%Y-%m-%d %H:%M:%S")
@@ -68,88 +106,63 @@ class ReportWriter:
             str(run_end - run_start).split(".")[0] if run_start and run_end else "—"
         )
 
-        # Counts
+        # Tally actions, labels, and detections in one pass over results
         total = len(results)
-        n_moved = sum(1 for r in results if r.action == SortAction.MOVED)
-        n_dry = sum(1 for r in results if r.action == SortAction.DRY_RUN)
-        n_dup = sum(1 for r in results if r.action == SortAction.SKIP_DUPLICATE)
-        n_det_err = sum(1 for r in results if r.action == SortAction.DETECTION_ERROR)
-        n_copy_err = sum(1 for r in results if r.action == SortAction.COPY_ERROR)
-        n_detected = sum(
-            1 for r in results if r.detection.detected
-            and r.action in (SortAction.MOVED, SortAction.SKIP_DUPLICATE, SortAction.DRY_RUN)
-        )
-
-        # Top detected labels
+        action_counts: Counter[SortAction] = Counter()
         label_counter: Counter[str] = Counter()
+        n_detected = 0
         for r in results:
-            for lbl in r.detection.labels:
-                label_counter[lbl] += 1
+            action_counts[r.action] += 1
+            label_counter.update(r.detection.labels)
+            if r.detection.detected and r.action in _DETECTED_ACTIONS:
+                n_detected += 1
+
+        n_moved = action_counts[SortAction.MOVED]
+        n_dry = action_counts[SortAction.DRY_RUN]
+        n_dup = action_counts[SortAction.SKIP_DUPLICATE]
+        n_det_err = action_counts[SortAction.DETECTION_ERROR]
+        n_copy_err = action_counts[SortAction.COPY_ERROR]
         top_labels = (
             ", ".join(f"{lbl} ({cnt})" for lbl, cnt in label_counter.most_common(10))
             or "—"
         )
 
-        lines: list[str] = [
-            "# dadcam Run Report",
-            "",
-            f"| Field | Value |",
-            f"|-------|-------|",
-            f"| Timestamp | {end_str} |",
-            f"| Host | {socket.gethostname()} |",
-            f"| Platform | {platform.platform()} |",
-            f"| Device | {device or '—'} |",
-            f"| Run start | {start_str} |",
-            f"| Run end | {end_str} |",
-            f"| Duration | {duration} |",
-            f"| Dry run | {'yes — no files were moved or removed' if n_dry > 0 else 'no'} |",
-            "",
-            "## Summary",
-            "",
-            f"| Metric | Count |",
-            f"|--------|-------|",
-            f"| Total files processed | {total} |",
-            f"| Moved to destination | {n_moved} |",
-            f"| Would move (dry run) | {n_dry} |",
-            f"| Skipped (duplicate) | {n_dup} |",
-            f"| Detection errors | {n_det_err} |",
-            f"| Copy errors | {n_copy_err} |",
-            f"| Files with detections | {n_detected} |",
-            f"| Top detected labels | {top_labels} |",
-            "",
-            "## Per-File Results",
-            "",
-            "| File | Type | Detected | Labels | Confidence | Action |",
-            "|------|------|----------|--------|------------|--------|",
-        ]
+        fh.write(
+            "# dadcam Run Report\n"
+            "\n"
+            "| Field | Value |\n"
+            "|-------|-------|\n"
+            f"| Timestamp | {end_str} |\n"
+            f"| Host | {socket.gethostname()} |\n"
+            f"| Platform | {platform.platform()} |\n"
+            f"| Device | {device or '—'} |\n"
+            f"| Run start | {start_str} |\n"
+            f"| Run end | {end_str} |\n"
+            f"| Duration | {duration} |\n"
+            f"| Dry run | {'yes — no files were moved or removed' if n_dry > 0 else 'no'} |\n"
+            "\n"
+            "## Summary\n"
+            "\n"
+            "| Metric | Count |\n"
+            "|--------|-------|\n"
+            f"| Total files processed | {total} |\n"
+            f"| Moved to destination | {n_moved} |\n"
+            f"| Would move (dry run) | {n_dry} |\n"
+            f"| Skipped (duplicate) | {n_dup} |\n"
+            f"| Detection errors | {n_det_err} |\n"
+            f"| Copy errors | {n_copy_err} |\n"
+            f"| Files with detections | {n_detected} |\n"
+            f"| Top detected labels | {top_labels} |\n"
+            "\n"
+            "## Per-File Results\n"
+            "\n"
+            "| File | Type | Detected | Labels | Confidence | Action |\n"
+            "|------|------|----------|--------|------------|--------|\n"
+        )
 
-        for r in results:
-            fname = r.media_file.path.name
-            ftype = r.media_file.media_type.name.lower()
-            det_icon = "✓" if r.detection.detected else "✗"
-            if r.detection.error:
-                det_icon = "⚠"
-            labels_str = (
-                ", ".join(r.detection.labels) if r.detection.labels else "—"
-            )
-            conf_str = (
-                ", ".join(f"{c:.2f}" for c in r.detection.confidences)
-                if r.detection.confidences
-                else "—"
-            )
-            action_str = r.action.name
-            if r.detection.error and r.action in (
-                SortAction.DETECTION_ERROR, SortAction.COPY_ERROR
-            ):
-                action_str = f"{action_str} ({r.detection.error})"
-
-            lines.append(
-                f"| {fname} | {ftype} | {det_icon} | "
-                f"{labels_str} | {conf_str} | {action_str} |"
-            )
-
-        lines += ["", "---", f"*Generated by dadcam*", ""]
-        return "\n".join(lines)
+        fh.writelines(_row(r) for r in results)
+
+        fh.write("\n---\n*Generated by dadcam*\n")
 
     # ------------------------------------------------------------------
     # Pruning old reports
@@ -16,71 +16,231 @@ expose a serial number.
 
 from __future__ import annotations
 
+import atexit
+import os
+import re
+import tempfile
+import threading
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import NamedTuple, TextIO
 
 WHITELIST_PATH = Path.home() / ".config" / "dadcam" / "whitelist.conf"
 
+class Entry(NamedTuple):
+    """One whitelist entry — a fraction of the footprint of the dict per
+    entry it replaces, with attribute access instead of key lookups."""
 
-def _ensure_file() -> None:
+    type: str   # "UUID" | "SERIAL"
+    value: str
+
+
+# One compiled pattern replaces the per-line strip/startswith/partition
+# chain: the whole file is scanned in C in a single pass.  Comment and
+# blank lines simply never match; surrounding whitespace — including the
+# \r of CRLF line endings — is absorbed by the pattern itself.
+_ENTRY_RE = re.compile(
+    rb"(?m)^[ \t]*(UUID|SERIAL)[ \t]*=[ \t]*([^\s#][^\r\n]*?)[ \t\r]*$",
+    re.IGNORECASE,
+)
+
+# Parse cache keyed by (st_mtime_ns, st_size): the entry list plus one
+# value set per entry type, built in the same pass.  The whitelist changes
+# rarely but is consulted on every card insert, so cache hits cost one
+# stat instead of an open+read+parse.  Writers drop the cache after
+# touching the file.
+_CACHE: (
+    tuple[tuple[int, int], list[Entry], frozenset[str], frozenset[str]]
+    | None
+) = None
+
+
+def _ensure_dir() -> None:
+    """Create the config directory for writers; readers never touch disk."""
     WHITELIST_PATH.parent.mkdir(parents=True, exist_ok=True)
-    if not WHITELIST_PATH.exists():
-        WHITELIST_PATH.write_text("# dadcam drive whitelist\n", encoding="utf-8")
 
 
-def load_entries() -> list[dict[str, str]]:
-    """Return a list of dicts with keys 'type' ('UUID'|'SERIAL') and 'value'."""
-    _ensure_file()
-    entries: list[dict[str, str]] = []
-    for line in WHITELIST_PATH.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" in line:
-            key, _, value = line.partition("=")
-            key = key.strip().upper()
-            value = value.strip()
-            if key in ("UUID", "SERIAL") and value:
-                entries.append({"type": key, "value": value})
-    return entries
+# Appends reuse one long-lived handle so a daemon that whitelists drives
+# over time pays the open/close syscalls once.  _APPEND_LOCK serializes
+# writers; remove_entry closes the handle before swapping in the new file
+# so it never points at a replaced inode.
+_APPEND_FH: TextIO | None = None
+_APPEND_LOCK = threading.Lock()
+
+
+def _get_appender() -> TextIO:
+    global _APPEND_FH
+    if _APPEND_FH is None or _APPEND_FH.closed:
+        _ensure_dir()
+        _APPEND_FH = open(WHITELIST_PATH, "a", encoding="utf-8")
+    return _APPEND_FH
+
+
+def _close_appender() -> None:
+    global _APPEND_FH
+    if _APPEND_FH is not None:
+        try:
+            _APPEND_FH.close()
+        except OSError:
+            pass
+        _APPEND_FH = None
+
+
+atexit.register(_close_appender)
+
+
+def _load() -> tuple[list[Entry], frozenset[str], frozenset[str]]:
+    """Parse the whitelist (through the mtime cache).
+
+    Returns the entry list plus the UUID and SERIAL value sets, all built
+    in a single pass over the file.
+    """
+    global _CACHE
+    try:
+        st = os.stat(WHITELIST_PATH)
+    except FileNotFoundError:
+        # No whitelist yet — readers must not create it as a side effect.
+        return [], frozenset(), frozenset()
+    cache_key = (st.st_mtime_ns, st.st_size)
+    if _CACHE is not None and _CACHE[0] == cache_key:
+        return _CACHE[1], _CACHE[2], _CACHE[3]
+
+    entries: list[Entry] = []
+    uuids: set[str] = set()
+    serials: set[str] = set()
+    for m in _ENTRY_RE.finditer(WHITELIST_PATH.read_bytes()):
+        raw_key = m.group(1)
+        # Nearly every entry is already uppercase; comparing is cheaper
+        # than unconditionally allocating a new string via upper().
+        if raw_key == b"UUID":
+            key = "UUID"
+        elif raw_key == b"SERIAL":
+            key = "SERIAL"
+        else:
+            key = raw_key.upper().decode()
+        value = m.group(2).decode("utf-8")
+        entries.append(Entry(key, value))
+        (uuids if key == "UUID" else serials).add(value)
+    result = (entries, frozenset(uuids), frozenset(serials))
+    _CACHE = (cache_key, *result)
+    return result
+
+
+def _load_sets() -> tuple[frozenset[str], frozenset[str]]:
+    """Return the (uuid_values, serial_values) sets for membership tests."""
+    _, uuids, serials = _load()
+    return uuids, serials
+
+
+def load_entries() -> list[Entry]:
+    """Return the parsed whitelist as a list of Entry tuples."""
+    entries, _, _ = _load()
+    # Shallow copy so callers can't mutate the cached list.
+    return list(entries)
+
+
+def make_checker() -> Callable[[str | None, str | None], bool]:
+    """Return a membership checker bound to the current whitelist.
+
+    Useful when probing many drives in a loop: the closure captures the
+    value sets once, skipping the per-call stat behind _load_sets.  It
+    does not see later whitelist edits — build a fresh checker after
+    writing.
+    """
+    uuids, serials = _load_sets()
+
+    def check(uuid: str | None, serial: str | None) -> bool:
+        return (uuid is not None and uuid in uuids) or (
+            serial is not None and serial in serials
+        )
+
+    return check
 
 
 def is_whitelisted(uuid: str | None, serial: str | None) -> bool:
     """Return True if either the UUID or serial matches a whitelist entry."""
-    for entry in load_entries():
-        if entry["type"] == "UUID" and uuid and entry["value"] == uuid:
-            return True
-        if entry["type"] == "SERIAL" and serial and entry["value"] == serial:
-            return True
-    return False
+    return make_checker()(uuid, serial)
+
+
+def add_entries(pairs: Iterable[tuple[str, str]]) -> None:
+    """Append all (type, value) *pairs* not already whitelisted.
+
+    The whitelist is parsed once and all new lines go out in a single
+    append write, so bulk imports (e.g. restoring a backup) cost one
+    read + one write instead of one of each per entry.  Duplicates —
+    against the file or within the batch — are silently skipped.
+    """
+    uuids, serials = _load_sets()
+    seen = {"UUID": set(uuids), "SERIAL": set(serials)}
+    new_lines: list[str] = []
+    for entry_type, value in pairs:
+        entry_type = entry_type.upper()
+        if entry_type not in ("UUID", "SERIAL"):
+            raise ValueError(
+                f"entry_type must be UUID or SERIAL, got: {entry_type!r}"
+            )
+        if not value or value in seen[entry_type]:
+            continue
+        seen[entry_type].add(value)
+        new_lines.append(f"{entry_type}={value}\n")
+    if not new_lines:
+        return
+    global _CACHE
+    with _APPEND_LOCK:
+        fh = _get_appender()
+        fh.write("".join(new_lines))
+        # Flush so readers (which go through the file) see the entries now.
+        fh.flush()
+    _CACHE = None
 
 
 def add_entry(entry_type: str, value: str) -> None:
     """Append a new UUID or SERIAL entry if not already present."""
-    _ensure_file()
-    entry_type = entry_type.upper()
-    if entry_type not in ("UUID", "SERIAL"):
-        raise ValueError(f"entry_type must be UUID or SERIAL, got: {entry_type!r}")
-    # Check for duplicates
-    for existing in load_entries():
-        if existing["type"] == entry_type and existing["value"] == value:
-            return  # already whitelisted
-    with open(WHITELIST_PATH, "a", encoding="utf-8") as fh:
-        fh.write(f"{entry_type}={value}\n")
+    add_entries([(entry_type, value)])
 
 
 def list_whitelist() -> list[str]:
     """Return formatted strings of all whitelist entries."""
-    return [f"{e['type']}={e['value']}" for e in load_entries()]
+    return [f"{e.type}={e.value}" for e in load_entries()]
 
 
 def remove_entry(entry_type: str, value: str) -> bool:
-    """Remove a specific entry. Returns True if an entry was removed."""
-    _ensure_file()
+    """Remove a specific entry. Returns True if an entry was removed.
+
+    Streams kept lines to a temp file in the same directory and swaps it
+    in with an atomic rename, so a crash mid-removal can never leave a
+    truncated whitelist.  Entries are matched on their parsed key/value,
+    not the raw line, so stray whitespace or a lowercased key still match.
+    """
+    global _CACHE
     entry_type = entry_type.upper()
-    original = WHITELIST_PATH.read_text(encoding="utf-8").splitlines(keepends=True)
-    target = f"{entry_type}={value}\n"
-    filtered = [line for line in original if line != target]
-    if len(filtered) == len(original):
+    removed = False
+    try:
+        src = open(WHITELIST_PATH, encoding="utf-8")
+    except FileNotFoundError:
         return False
-    WHITELIST_PATH.write_text("".join(filtered), encoding="utf-8")
-    return True
+    with src, tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=WHITELIST_PATH.parent,
+        prefix=".whitelist-",
+        delete=False,
+    ) as tmp:
+        for line in src:
+            if not removed:
+                stripped = line.strip()
+                if stripped and not stripped.startswith("#"):
+                    key, _, val = stripped.partition("=")
+                    if key.strip().upper() == entry_type and val.strip() == value:
+                        removed = True
+                        continue
+            tmp.write(line)
+        tmp_name = tmp.name
+    if removed:
+        with _APPEND_LOCK:
+            _close_appender()
+            os.replace(tmp_name, WHITELIST_PATH)
+        _CACHE = None
+    else:
+        os.unlink(tmp_name)
+    return removed